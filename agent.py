@@ -1,17 +1,16 @@
 import asyncio
 import os
 import random
-import sys
 import traceback
 from pathlib import Path
-from typing import Any, Callable, cast
+from typing import Any, Callable
 
-from dotenv import load_dotenv
+import httpx
 from google import genai
 from google.genai import errors as genai_errors
 from google.genai import types
 
-from errors import AgentError
+from errors import AgentError, ErrorCode
 from logging_config import logger
 from models import AgentResult
 from prompts import SYSTEM_PROMPT
@@ -20,19 +19,262 @@ from schema import SessionState
 from tools import CodebaseTools
 
 
-class DeveloperAgent:
-    def __init__(self, working_dir: str):
-        load_dotenv()
+_TOOL_CONFIG = types.Tool(
+    function_declarations=[
+        types.FunctionDeclaration(
+            name="read_file",
+            description="Read the contents of a file",
+            parameters=types.Schema(
+                type=types.Type.OBJECT,
+                properties={
+                    "path": types.Schema(
+                        type=types.Type.STRING,
+                        description="Path to the file to read",
+                    ),
+                    "max_chars": types.Schema(
+                        type=types.Type.INTEGER,
+                        description="Maximum characters to read",
+                        default=10000,
+                    ),
+                },
+                required=["path"],
+            ),
+        ),
+        types.FunctionDeclaration(
+            name="write_file",
+            description="Write content to a file",
+            parameters=types.Schema(
+                type=types.Type.OBJECT,
+                properties={
+                    "path": types.Schema(
+                        type=types.Type.STRING,
+                        description="Path to the file to write",
+                    ),
+                    "content": types.Schema(
+                        type=types.Type.STRING,
+                        description="Content to write to the file",
+                    ),
+                },
+                required=["path", "content"],
+            ),
+        ),
+        types.FunctionDeclaration(
+            name="list_files",
+            description="List files and directories",
+            parameters=types.Schema(
+                type=types.Type.OBJECT,
+                properties={
+                    "directory": types.Schema(
+                        type=types.Type.STRING,
+                        description="Directory to list",
+                        default=".",
+                    )
+                },
+            ),
+        ),
+        types.FunctionDeclaration(
+            name="create_directory",
+            description="Create a new directory",
+            parameters=types.Schema(
+                type=types.Type.OBJECT,
+                properties={
+                    "path": types.Schema(
+                        type=types.Type.STRING,
+                        description="Path of the directory to create",
+                    ),
+                    "recursive": types.Schema(
+                        type=types.Type.BOOLEAN,
+                        description="Create parent directories if needed",
+                        default=True,
+                    ),
+                },
+                required=["path"],
+            ),
+        ),
+        types.FunctionDeclaration(
+            name="search_files",
+            description="Search for text patterns in files",
+            parameters=types.Schema(
+                type=types.Type.OBJECT,
+                properties={
+                    "pattern": types.Schema(
+                        type=types.Type.STRING,
+                        description="Text pattern to search for",
+                    ),
+                    "file_extensions": types.Schema(
+                        type=types.Type.ARRAY,
+                        items=types.Schema(type=types.Type.STRING),
+                        description="File extensions to search in",
+                    ),
+                    "case_sensitive": types.Schema(
+                        type=types.Type.BOOLEAN,
+                        description="Whether search is case sensitive",
+                        default=False,
+                    ),
+                    "max_results": types.Schema(
+                        type=types.Type.INTEGER,
+                        description="Maximum number of results",
+                        default=50,
+                    ),
+                },
+                required=["pattern"],
+            ),
+        ),
+        types.FunctionDeclaration(
+            name="git_status",
+            description="Get git repository status",
+            parameters=types.Schema(type=types.Type.OBJECT, properties={}),
+        ),
+        types.FunctionDeclaration(
+            name="git_diff",
+            description="Get git diff for changes",
+            parameters=types.Schema(
+                type=types.Type.OBJECT,
+                properties={
+                    "file_path": types.Schema(
+                        type=types.Type.STRING,
+                        description="Specific file to diff (optional)",
+                    )
+                },
+            ),
+        ),
+        types.FunctionDeclaration(
+            name="git_commit",
+            description="Create a git commit",
+            parameters=types.Schema(
+                type=types.Type.OBJECT,
+                properties={
+                    "message": types.Schema(
+                        type=types.Type.STRING,
+                        description="Commit message",
+                    ),
+                    "add_all": types.Schema(
+                        type=types.Type.BOOLEAN,
+                        description="Stage all changes before committing",
+                        default=False,
+                    ),
+                },
+                required=["message"],
+            ),
+        ),
+    ],
+    code_execution=types.ToolCodeExecution(),
+)
+
+_GEN_CONFIG = types.GenerateContentConfig(
+    tools=[_TOOL_CONFIG],
+    system_instruction=SYSTEM_PROMPT,
+    temperature=0.2,
+    max_output_tokens=8192,
+)
+
+
+_QUOTA_MARKERS = ("429", "quota", "resource_exhausted")
+_AUTH_MARKERS = ("401", "403", "invalid")
+
+_QUOTA_MESSAGE = (
+    "API Quota Exceeded\n\n"
+    "Your Gemini API key has exceeded its quota. Please:\n"
+    "1. Check your API quota at https://ai.dev/rate-limit\n"
+    "2. Wait for quota to reset, or\n"
+    "3. Upgrade your API plan\n\n"
+    "Technical details: {details}"
+)
+
+_AUTH_MESSAGE = (
+    "API Authentication Error\n\n"
+    "There's an issue with your API key. Please:\n"
+    "1. Verify your API key in .env file\n"
+    "2. Get a new key from https://aistudio.google.com/app/apikey\n"
+    "3. Make sure GEMINI_API_KEY is set correctly\n\n"
+    "Technical details: {details}"
+)
+
+_READONLY_FUNCTIONS = frozenset(
+    {"read_file", "list_files", "search_files", "git_status", "git_diff"}
+)
+
+
+_GLOBAL_CLIENT: genai.Client | None = None
+
+
+def _get_client() -> genai.Client:
+    global _GLOBAL_CLIENT
+    if _GLOBAL_CLIENT is None:
         api_key = os.getenv("GEMINI_API_KEY")
         if not api_key:
             raise RuntimeError("GEMINI_API_KEY environment variable not set")
 
-        self.client = genai.Client(api_key=api_key)
+        _GLOBAL_CLIENT = genai.Client(
+            api_key=api_key,
+            http_options=types.HttpOptions(
+                async_client_args={
+                    "limits": httpx.Limits(
+                        max_connections=200, max_keepalive_connections=100
+                    )
+                }
+            ),
+        )
+    return _GLOBAL_CLIENT
+
+
+async def close_client() -> None:
+    global _GLOBAL_CLIENT
+    if _GLOBAL_CLIENT is None:
+        return
+    # google-genai 1.12 has no public aclose(); release the pooled
+    # keep-alive connections held by its async httpx client directly.
+    await _GLOBAL_CLIENT._api_client._async_httpx_client.aclose()
+    _GLOBAL_CLIENT = None
+
+
+def _cache_key(function_name: str, args: dict[str, Any]) -> tuple:
+    return function_name, tuple(
+        sorted(
+            (key, tuple(value) if isinstance(value, list) else value)
+            for key, value in args.items()
+        )
+    )
+
+
+def _history_chars(messages: list[types.Content]) -> int:
+    total = 0
+    for content in messages:
+        for part in content.parts or ():
+            if part.text:
+                total += len(part.text)
+            elif part.function_call:
+                total += len(str(part.function_call.args))
+            elif part.function_response:
+                total += len(str(part.function_response.response))
+    return total
+
+
+class DeveloperAgent:
+    def __init__(self, working_dir: str):
+        self.client = _get_client()
         self.state = SessionState()
         self.tools = CodebaseTools(Path(working_dir).resolve(), self.state)
         self.api_rate_limiter = RateLimiter(max_calls=10, period=60.0)
         self.tool_rate_limiter = RateLimiter(max_calls=30, period=60.0)
 
+        self.max_tool_output_chars = 20_000
+        self.max_context_chars = 100_000
+        self.keep_recent_turns = 3
+
+        self._tool_cache: dict[tuple, tuple[str, dict | None]] = {}
+        self._cache_generation = 0
+        self._function_map: dict[str, Callable[..., Any]] = {
+            "read_file": self.tools.read_file,
+            "write_file": self.tools.write_file,
+            "list_files": self.tools.list_files,
+            "create_directory": self.tools.create_directory,
+            "search_files": self.tools.search_files,
+            "git_status": self.tools.git_status,
+            "git_diff": self.tools.git_diff,
+            "git_commit": self.tools.git_commit,
+        }
+
     async def run(
         self, prompt: str, verbose: bool = False, max_iterations: int = 20
     ) -> AgentResult:
@@ -40,203 +282,36 @@ class DeveloperAgent:
             "Starting agent run", prompt=prompt[:100], max_iterations=max_iterations
         )
 
-        tool_config = types.Tool(
-            function_declarations=[
-                types.FunctionDeclaration(
-                    name="read_file",
-                    description="Read the contents of a file",
-                    parameters=cast(
-                        types.Schema,
-                        {
-                            "type": "object",
-                            "properties": {
-                                "path": {
-                                    "type": "string",
-                                    "description": "Path to the file to read",
-                                },
-                                "max_chars": {
-                                    "type": "integer",
-                                    "description": "Maximum characters to read",
-                                    "default": 10000,
-                                },
-                            },
-                            "required": ["path"],
-                        },
-                    ),
-                ),
-                types.FunctionDeclaration(
-                    name="write_file",
-                    description="Write content to a file",
-                    parameters=cast(
-                        types.Schema,
-                        {
-                            "type": "object",
-                            "properties": {
-                                "path": {
-                                    "type": "string",
-                                    "description": "Path to the file to write",
-                                },
-                                "content": {
-                                    "type": "string",
-                                    "description": "Content to write to the file",
-                                },
-                            },
-                            "required": ["path", "content"],
-                        },
-                    ),
-                ),
-                types.FunctionDeclaration(
-                    name="list_files",
-                    description="List files and directories",
-                    parameters=cast(
-                        types.Schema,
-                        {
-                            "type": "object",
-                            "properties": {
-                                "directory": {
-                                    "type": "string",
-                                    "description": "Directory to list",
-                                    "default": ".",
-                                }
-                            },
-                        },
-                    ),
-                ),
-                types.FunctionDeclaration(
-                    name="create_directory",
-                    description="Create a new directory",
-                    parameters=cast(
-                        types.Schema,
-                        {
-                            "type": "object",
-                            "properties": {
-                                "path": {
-                                    "type": "string",
-                                    "description": "Path of the directory to create",
-                                },
-                                "recursive": {
-                                    "type": "boolean",
-                                    "description": "Create parent directories if needed",
-                                    "default": True,
-                                },
-                            },
-                            "required": ["path"],
-                        },
-                    ),
-                ),
-                types.FunctionDeclaration(
-                    name="search_files",
-                    description="Search for text patterns in files",
-                    parameters=cast(
-                        types.Schema,
-                        {
-                            "type": "object",
-                            "properties": {
-                                "pattern": {
-                                    "type": "string",
-                                    "description": "Text pattern to search for",
-                                },
-                                "file_extensions": {
-                                    "type": "array",
-                                    "items": {"type": "string"},
-                                    "description": "File extensions to search in",
-                                },
-                                "case_sensitive": {
-                                    "type": "boolean",
-                                    "description": "Whether search is case sensitive",
-                                    "default": False,
-                                },
-                                "max_results": {
-                                    "type": "integer",
-                                    "description": "Maximum number of results",
-                                    "default": 50,
-                                },
-                            },
-                            "required": ["pattern"],
-                        },
-                    ),
-                ),
-                types.FunctionDeclaration(
-                    name="git_status",
-                    description="Get git repository status",
-                    parameters=cast(types.Schema, {"type": "object", "properties": {}}),
-                ),
-                types.FunctionDeclaration(
-                    name="git_diff",
-                    description="Get git diff for changes",
-                    parameters=cast(
-                        types.Schema,
-                        {
-                            "type": "object",
-                            "properties": {
-                                "file_path": {
-                                    "type": "string",
-                                    "description": "Specific file to diff (optional)",
-                                }
-                            },
-                        },
-                    ),
-                ),
-                types.FunctionDeclaration(
-                    name="git_commit",
-                    description="Create a git commit",
-                    parameters=cast(
-                        types.Schema,
-                        {
-                            "type": "object",
-                            "properties": {
-                                "message": {
-                                    "type": "string",
-                                    "description": "Commit message",
-                                },
-                                "add_all": {
-                                    "type": "boolean",
-                                    "description": "Stage all changes before committing",
-                                    "default": False,
-                                },
-                            },
-                            "required": ["message"],
-                        },
-                    ),
-                ),
-            ],
-            code_execution=types.ToolCodeExecution(),
-        )
+        self._invalidate_tool_cache()
 
         messages = [types.Content(role="user", parts=[types.Part(text=prompt)])]
         total_tokens = 0
         functions_called = 0
+        omitted_calls = 0
         errors: list[str] = []
+        next_api_slot: asyncio.Task | None = None
 
         for iteration in range(max_iterations):
-            logger.info("Agent iteration", iteration=iteration + 1)
+            logger.debug("Agent iteration", iteration=iteration + 1)
+            iteration_tokens = 0
+            errors_before = len(errors)
 
             try:
-                await self.api_rate_limiter.acquire()
-                loop = asyncio.get_event_loop()
-
-                def _generate_content():
-                    return self.client.models.generate_content(
-                        model="gemini-2.5-flash",
-                        contents=messages,
-                        config=types.GenerateContentConfig(
-                            tools=[tool_config],
-                            system_instruction=SYSTEM_PROMPT,
-                            temperature=0.2,
-                            max_output_tokens=8192,
-                        ),
-                    )
-
-                async def call_api():
-                    return await loop.run_in_executor(None, _generate_content)
-
-                response = await self._call_with_retry(call_api)
+                if next_api_slot is None:
+                    await self.api_rate_limiter.acquire()
+                else:
+                    await next_api_slot
+                    next_api_slot = None
+                response = await self._call_with_retry(
+                    self._generate, messages, verbose
+                )
 
                 if response.usage_metadata:
                     prompt_tokens = response.usage_metadata.prompt_token_count
                     response_tokens = response.usage_metadata.candidates_token_count
-                    total_tokens += prompt_tokens + response_tokens
-                    logger.info(
+                    iteration_tokens = prompt_tokens + response_tokens
+                    total_tokens += iteration_tokens
+                    logger.debug(
                         "Token usage",
                         iteration=iteration + 1,
                         prompt_tokens=prompt_tokens,
@@ -248,6 +323,8 @@ class DeveloperAgent:
                     messages.append(response.candidates[0].content)
 
                 if not response.function_calls:
+                    final_text = response.text
+                    messages.clear()
                     logger.success(
                         "Agent completed successfully",
                         iterations=iteration + 1,
@@ -257,67 +334,79 @@ class DeveloperAgent:
                     )
 
                     return AgentResult(
-                        response=response.text,
+                        response=final_text,
                         iterations=iteration + 1,
                         tokens_used=total_tokens,
                         functions_called=functions_called,
                         errors=errors,
+                        streamed=verbose and bool(final_text),
                     )
 
-                logger.info(
+                logger.opt(lazy=True).debug(
                     "Executing function calls",
-                    count=len(response.function_calls),
-                    functions=[fc.name for fc in response.function_calls],
+                    count=lambda: len(response.function_calls),
+                    functions=lambda: [fc.name for fc in response.function_calls],
                 )
 
-                function_responses = []
-                for function_call in response.function_calls:
-                    functions_called += 1
+                # The next request needs the tool results, but its rate-limit
+                # wait does not: overlap the two.
+                next_api_slot = asyncio.create_task(self.api_rate_limiter.acquire())
+
+                functions_called += len(response.function_calls)
+                results = await self._run_tools(response.function_calls)
 
-                    try:
-                        await self.tool_rate_limiter.acquire()
-                        result = await self._execute_function_call(function_call)
+                function_responses = []
+                for function_call, result, error in results:
+                    if error is None:
+                        if len(result) > self.max_tool_output_chars:
+                            await self.state.add_tool_output(
+                                {"function": function_call.name, "output": result}
+                            )
+                            result = (
+                                result[: self.max_tool_output_chars]
+                                + f"\n[... truncated to {self.max_tool_output_chars} chars]"
+                            )
                         function_responses.append(
                             types.Part.from_function_response(
                                 name=function_call.name, response={"result": result}
                             )
                         )
-                        logger.success(
+                        logger.opt(lazy=True).debug(
                             "Function executed successfully",
-                            function=function_call.name,
-                            result_length=len(str(result)),
+                            function=lambda: function_call.name,
+                            result_length=lambda: len(result),
                         )
 
-                    except AgentError as e:
-                        error_msg = f"{function_call.name}: {e}"
+                    elif isinstance(error, AgentError):
+                        error_msg = f"{function_call.name}: {error}"
                         errors.append(error_msg)
                         logger.error(
                             "Function error",
                             function=function_call.name,
-                            error_code=e.code.value,
-                            error_message=e.message,
+                            error_code=error.code.value,
+                            error_message=error.message,
                         )
 
                         function_responses.append(
                             types.Part.from_function_response(
-                                name=function_call.name, response={"error": e.to_dict()}
+                                name=function_call.name,
+                                response={"error": error.to_dict()},
                             )
                         )
 
-                    except Exception as e:
-                        exc_type, exc_value, exc_tb = sys.exc_info()
-                        tb_str = "".join(
-                            traceback.format_exception(exc_type, exc_value, exc_tb)
-                        )
-
-                        error_msg = f"{function_call.name}: {e}"
+                    else:
+                        error_msg = f"{function_call.name}: {error}"
                         errors.append(error_msg)
                         logger.error(
                             "Unexpected function error",
                             function=function_call.name,
-                            error=str(e),
-                            traceback=tb_str,
-                            exc_info=True,
+                            error=str(error),
+                        )
+                        logger.opt(exception=error).debug(
+                            "Function traceback", function=function_call.name
+                        )
+                        tb_str = "".join(
+                            traceback.format_tb(error.__traceback__, limit=-3)
                         )
 
                         function_responses.append(
@@ -325,8 +414,8 @@ class DeveloperAgent:
                                 name=function_call.name,
                                 response={
                                     "error": {
-                                        "message": str(e),
-                                        "type": type(e).__name__,
+                                        "message": str(error),
+                                        "type": type(error).__name__,
                                         "traceback": tb_str[-500:],
                                     }
                                 },
@@ -334,6 +423,15 @@ class DeveloperAgent:
                         )
 
                 messages.append(types.Content(role="user", parts=function_responses))
+                omitted_calls = self._trim_history(messages, prompt, omitted_calls)
+
+                logger.opt(lazy=True).info(
+                    "Iteration complete",
+                    iteration=lambda: iteration + 1,
+                    functions=lambda: [fc.name for fc in response.function_calls],
+                    tokens_delta=lambda: iteration_tokens,
+                    errors_delta=lambda: len(errors) - errors_before,
+                )
 
             except genai_errors.ClientError as e:
                 if (
@@ -355,12 +453,13 @@ class DeveloperAgent:
             except Exception as e:
                 error_details = str(e)
                 error_type = type(e).__name__
-                
+
                 if isinstance(e, RuntimeError) and "Failed after" in error_details:
                     if ":" in error_details:
                         error_details = error_details.split(":", 1)[1].strip()
-                
-                if "429" in error_details or "quota" in error_details.lower() or "RESOURCE_EXHAUSTED" in error_details:
+
+                details_lower = error_details.lower()
+                if any(marker in details_lower for marker in _QUOTA_MARKERS):
                     logger.error(
                         "API quota exceeded",
                         iteration=iteration + 1,
@@ -369,15 +468,8 @@ class DeveloperAgent:
                         suggestion="Check quota at https://ai.dev/rate-limit or upgrade plan",
                         exc_info=True,
                     )
-                    user_message = (
-                        "API Quota Exceeded\n\n"
-                        "Your Gemini API key has exceeded its quota. Please:\n"
-                        "1. Check your API quota at https://ai.dev/rate-limit\n"
-                        "2. Wait for quota to reset, or\n"
-                        "3. Upgrade your API plan\n\n"
-                        f"Technical details: {error_details}"
-                    )
-                elif "401" in error_details or "403" in error_details or "invalid" in error_details.lower():
+                    user_message = _QUOTA_MESSAGE.format(details=error_details)
+                elif any(marker in details_lower for marker in _AUTH_MARKERS):
                     logger.error(
                         "API authentication error",
                         iteration=iteration + 1,
@@ -386,14 +478,7 @@ class DeveloperAgent:
                         suggestion="Verify API key in .env file or get new key from https://aistudio.google.com/app/apikey",
                         exc_info=True,
                     )
-                    user_message = (
-                        "API Authentication Error\n\n"
-                        "There's an issue with your API key. Please:\n"
-                        "1. Verify your API key in .env file\n"
-                        "2. Get a new key from https://aistudio.google.com/app/apikey\n"
-                        "3. Make sure GEMINI_API_KEY is set correctly\n\n"
-                        f"Technical details: {error_details}"
-                    )
+                    user_message = _AUTH_MESSAGE.format(details=error_details)
                 else:
                     logger.error(
                         "Unrecoverable error",
@@ -403,7 +488,7 @@ class DeveloperAgent:
                         exc_info=True,
                     )
                     user_message = f"Error: {error_details}\n\nError type: {error_type}"
-                
+
                 return AgentResult(
                     response=user_message,
                     iterations=iteration + 1,
@@ -412,6 +497,9 @@ class DeveloperAgent:
                     errors=[error_details],
                 )
 
+        if next_api_slot is not None:
+            next_api_slot.cancel()
+
         logger.warning("Maximum iterations reached", max_iterations=max_iterations)
         return AgentResult(
             response="Maximum iterations reached without completion",
@@ -421,44 +509,178 @@ class DeveloperAgent:
             errors=errors,
         )
 
+    def _trim_history(
+        self, messages: list[types.Content], prompt: str, omitted_calls: int
+    ) -> int:
+        keep = 2 * self.keep_recent_turns
+        if (
+            len(messages) <= keep + 1
+            or _history_chars(messages) <= self.max_context_chars
+        ):
+            return omitted_calls
+
+        dropped = messages[1:-keep]
+        omitted_calls += sum(
+            1 for content in dropped for part in content.parts or () if part.function_call
+        )
+        logger.info(
+            "Trimming conversation history",
+            dropped_messages=len(dropped),
+            omitted_calls=omitted_calls,
+        )
+
+        messages[:-keep] = [
+            types.Content(
+                role="user",
+                parts=[
+                    types.Part(text=prompt),
+                    types.Part(
+                        text=f"[TRUNCATED: {omitted_calls} earlier tool calls omitted]"
+                    ),
+                ],
+            )
+        ]
+        return omitted_calls
+
+    async def _run_tools(
+        self, function_calls: list
+    ) -> list[tuple[Any, str | None, Exception | None]]:
+        results = []
+        pending = []
+        for function_call in function_calls:
+            if function_call.name in _READONLY_FUNCTIONS:
+                pending.append(function_call)
+                continue
+            if pending:
+                results.extend(
+                    await asyncio.gather(*(self._run_tool(fc) for fc in pending))
+                )
+                pending = []
+            results.append(await self._run_tool(function_call))
+        if pending:
+            results.extend(
+                await asyncio.gather(*(self._run_tool(fc) for fc in pending))
+            )
+        return results
+
+    async def _run_tool(
+        self, function_call
+    ) -> tuple[Any, str | None, Exception | None]:
+        await self.tool_rate_limiter.acquire()
+        try:
+            result = await self._execute_function_call(function_call)
+        except Exception as e:
+            return function_call, None, e
+        return function_call, result, None
+
     async def _execute_function_call(self, function_call) -> str:
         function_name = function_call.name
         args = dict(function_call.args) if function_call.args else {}
 
-        function_map: dict[str, Callable[..., Any]] = {
-            "read_file": self.tools.read_file,
-            "write_file": self.tools.write_file,
-            "list_files": self.tools.list_files,
-            "create_directory": self.tools.create_directory,
-            "search_files": self.tools.search_files,
-            "git_status": self.tools.git_status,
-            "git_diff": self.tools.git_diff,
-            "git_commit": self.tools.git_commit,
-        }
-
-        if function_name not in function_map:
-            from errors import ErrorCode
-
+        func = self._function_map.get(function_name)
+        if func is None:
             raise AgentError(
                 code=ErrorCode.FUNCTION_NOT_FOUND,
                 message=f"Unknown function: {function_name}",
-                suggestions=[f"Available functions: {', '.join(function_map.keys())}"],
+                suggestions=[
+                    f"Available functions: {', '.join(self._function_map.keys())}"
+                ],
                 context={"requested_function": function_name},
             )
 
-        func = function_map[function_name]
-        return await func(**args)
+        if function_name not in _READONLY_FUNCTIONS:
+            try:
+                return await func(**args)
+            finally:
+                self._invalidate_tool_cache()
+
+        key = _cache_key(function_name, args)
+        cached = self._tool_cache.get(key)
+        if cached is not None:
+            logger.debug("Tool cache hit", function=function_name)
+            result, search = cached
+            if search is not None:
+                await self.state.add_search_performed(dict(search))
+            return result
+
+        generation = self._cache_generation
+        result = await func(**args)
+        # search_files records its search right before returning, with no
+        # await in between, so the newest entry belongs to this call.
+        search = (
+            self.state.searches_performed[-1]
+            if function_name == "search_files"
+            else None
+        )
+        if generation == self._cache_generation:
+            self._tool_cache[key] = (result, search)
+        return result
+
+    def _invalidate_tool_cache(self) -> None:
+        self._tool_cache.clear()
+        self._cache_generation += 1
+
+    async def _generate(
+        self, messages: list[types.Content], verbose: bool = False
+    ) -> types.GenerateContentResponse:
+        stream = await self.client.aio.models.generate_content_stream(
+            model="gemini-2.5-flash",
+            contents=messages,
+            config=_GEN_CONFIG,
+        )
+
+        parts: list[types.Part] = []
+        text_chunks: list[str] = []
+        streamed_text = False
+        usage_metadata = None
+        try:
+            async for chunk in stream:
+                if chunk.usage_metadata:
+                    usage_metadata = chunk.usage_metadata
+                if not chunk.candidates or not chunk.candidates[0].content:
+                    continue
+
+                for part in chunk.candidates[0].content.parts or ():
+                    if part.text is not None and not part.thought:
+                        text_chunks.append(part.text)
+                        if verbose:
+                            print(part.text, end="", flush=True)
+                            streamed_text = True
+                        continue
+                    if text_chunks:
+                        parts.append(types.Part(text="".join(text_chunks)))
+                        text_chunks.clear()
+                    parts.append(part)
+        except Exception:
+            if streamed_text:
+                print("\n[stream interrupted]", flush=True)
+            raise
+
+        if text_chunks:
+            parts.append(types.Part(text="".join(text_chunks)))
+        if streamed_text:
+            print()
+
+        return types.GenerateContentResponse(
+            candidates=[
+                types.Candidate(content=types.Content(role="model", parts=parts))
+            ],
+            usage_metadata=usage_metadata,
+        )
 
     async def _call_with_retry(
         self,
-        func: Callable[[], Any],
+        func: Callable[..., Any],
+        *args: Any,
         max_retries: int = 3,
         base_delay: float = 1.0,
+        max_delay: float = 60.0,
     ) -> Any:
         last_exception: Exception | None = None
+        delay = base_delay
         for attempt in range(max_retries):
             try:
-                return await func()
+                return await func(*args)
 
             except genai_errors.ClientError as e:
                 last_exception = e
@@ -475,7 +697,7 @@ class DeveloperAgent:
                             raise RuntimeError(
                                 f"Rate limit exceeded after {max_retries} retries: {e}"
                             )
-                        delay = base_delay * (2**attempt) + random.uniform(0, 1)
+                        delay = min(max_delay, random.uniform(base_delay, delay * 3))
                         await asyncio.sleep(delay)
                         continue
                     elif e.status_code >= 400 and e.status_code < 500:
@@ -508,9 +730,9 @@ class DeveloperAgent:
                     raise RuntimeError(
                         f"Server error after {max_retries} retries: {e}"
                     )
-                delay = base_delay * (2**attempt)
+                delay = min(max_delay, random.uniform(base_delay, delay * 3))
                 await asyncio.sleep(delay)
-            
+
             except Exception as e:
                 last_exception = e
                 logger.error(
@@ -525,7 +747,7 @@ class DeveloperAgent:
                     raise RuntimeError(
                         f"Unexpected error after {max_retries} retries: {type(e).__name__}: {e}"
                     )
-                delay = base_delay * (2**attempt)
+                delay = min(max_delay, random.uniform(base_delay, delay * 3))
                 await asyncio.sleep(delay)
 
         error_msg = f"Failed after {max_retries} retries"
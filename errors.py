@@ -25,22 +25,26 @@ class AgentError(Exception):
         context: dict[str, Any] | None = None,
     ):
         self.code = code
+        self._code_value = code.value
         self.message = message
         self.suggestions = suggestions or []
         self.context = context or {}
         super().__init__(message)
 
     def to_dict(self) -> dict[str, Any]:
-        """Serialize for AI consumption."""
-        return {
-            "error_code": self.code.value,
+        """Serialize for AI consumption, omitting empty fields."""
+        data: dict[str, Any] = {
+            "error_code": self._code_value,
             "message": self.message,
-            "suggestions": self.suggestions,
-            "context": self.context,
         }
+        if self.suggestions:
+            data["suggestions"] = self.suggestions
+        if self.context:
+            data["context"] = self.context
+        return data
 
     def __str__(self) -> str:
-        return f"{self.code.value}: {self.message}"
+        return f"{self._code_value}: {self.message}"
 
 
 class FileError(AgentError):
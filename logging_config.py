@@ -13,6 +13,7 @@ def setup_logging(log_level: str = "INFO", log_file: Path | None = None):
         sink=sys.stderr,
         level=log_level.upper(),
         format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan> - <level>{message}</level>",
+        enqueue=True,
     )
 
     if log_file:
@@ -21,4 +22,5 @@ def setup_logging(log_level: str = "INFO", log_file: Path | None = None):
             level=log_level.upper(),
             format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function} - {message}",
             rotation="10 MB",
+            enqueue=True,
         )
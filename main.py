@@ -1,12 +1,24 @@
 import argparse
 import asyncio
+from pathlib import Path
+
+from dotenv import load_dotenv
 
 from logging_config import setup_logging, logger
 
+load_dotenv()
+
 
 async def main():
     parser = argparse.ArgumentParser(description="AI Code Assistant")
-    parser.add_argument("user_prompt", type=str, help="Prompt to send to the agent")
+    parser.add_argument(
+        "user_prompt", type=str, nargs="?", help="Prompt to send to the agent"
+    )
+    parser.add_argument(
+        "--prompts-file",
+        type=Path,
+        help="File with one prompt per line, run concurrently",
+    )
     parser.add_argument("--verbose", action="store_true", help="Enable verbose output")
     parser.add_argument("--summary", action="store_true", help="Show session summary")
     parser.add_argument(
@@ -15,34 +27,61 @@ async def main():
     parser.add_argument("--log-level", default="INFO", help="Logging level")
     args = parser.parse_args()
 
+    if args.prompts_file and args.user_prompt:
+        parser.error("pass either a prompt or --prompts-file, not both")
+    elif args.prompts_file:
+        prompts = [
+            line.strip()
+            for line in args.prompts_file.read_text(encoding="utf-8").splitlines()
+            if line.strip()
+        ]
+        if not prompts:
+            parser.error(f"--prompts-file {args.prompts_file} contains no prompts")
+    elif args.user_prompt:
+        prompts = [args.user_prompt]
+    else:
+        parser.error("a prompt or --prompts-file is required")
+
     setup_logging(log_level=args.log_level)
 
-    from agent import DeveloperAgent
+    from agent import DeveloperAgent, close_client
 
     agent = DeveloperAgent(args.workspace)
+    stream = args.verbose and len(prompts) == 1
+    try:
+        results = await asyncio.gather(
+            *(agent.run(prompt, verbose=stream) for prompt in prompts)
+        )
+    finally:
+        await close_client()
 
-    result = await agent.run(args.user_prompt, verbose=args.verbose)
+    logger.info("Agent execution completed", prompts=len(prompts))
+    for prompt, result in zip(prompts, results):
+        if len(prompts) > 1:
+            print(f"\nPrompt: {prompt}")
+        print("\nFinal response:")
+        print("(streamed above)" if result.streamed else result.response)
 
-    logger.info("Agent execution completed")
-    print("\nFinal response:")
-    print(result.response)
+        if args.summary:
+            logger.info(
+                "Session summary",
+                iterations=result.iterations,
+                tokens_used=result.tokens_used,
+                functions_called=result.functions_called,
+                errors=len(result.errors),
+            )
+            print("\nSession Summary:")
+            print(f"Iterations: {result.iterations}")
+            print(f"Tokens used: {result.tokens_used}")
+            print(f"Functions called: {result.functions_called}")
+            if result.errors:
+                print(f"Errors: {len(result.errors)}")
 
     if args.summary:
-        logger.info(
-            "Session summary",
-            iterations=result.iterations,
-            tokens_used=result.tokens_used,
-            functions_called=result.functions_called,
-            errors=len(result.errors),
-        )
-        print("\nSession Summary:")
-        print(f"Iterations: {result.iterations}")
-        print(f"Tokens used: {result.tokens_used}")
-        print(f"Functions called: {result.functions_called}")
-        if result.errors:
-            print(f"Errors: {len(result.errors)}")
         print(agent.state.summary())
 
+    await logger.complete()
+
 
 if __name__ == "__main__":
     asyncio.run(main())
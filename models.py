@@ -1,13 +1,14 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentResult:
     response: str
     iterations: int
     tokens_used: int
     functions_called: int
     errors: list[str]
+    streamed: bool = False
 
     def __str__(self) -> str:
         return self.response
@@ -1,58 +1,92 @@
-import asyncio
+from collections.abc import Iterator, KeysView, Sequence
 from dataclasses import dataclass, field
-from typing import Set
 
 
-@dataclass
+class _SequenceView(Sequence):
+    __slots__ = ("_items",)
+
+    def __init__(self, items: list):
+        self._items = items
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator:
+        return iter(self._items)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._items!r})"
+
+
+@dataclass(slots=True)
 class SessionState:
-    _files_read: Set[str] = field(default_factory=set, init=False, repr=False)
-    _files_written: Set[str] = field(default_factory=set, init=False, repr=False)
+    _files_read: dict[str, None] = field(default_factory=dict, init=False, repr=False)
+    _files_written: dict[str, None] = field(
+        default_factory=dict, init=False, repr=False
+    )
     _commands_run: list[dict] = field(default_factory=list, init=False, repr=False)
     _searches_performed: list[dict] = field(
         default_factory=list, init=False, repr=False
     )
-    _lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False, repr=False)
+    _tool_outputs: list[dict] = field(default_factory=list, init=False, repr=False)
 
     async def add_file_read(self, path: str):
-        async with self._lock:
-            self._files_read.add(path)
+        self._files_read[path] = None
 
     async def add_file_written(self, path: str):
-        async with self._lock:
-            self._files_written.add(path)
+        self._files_written[path] = None
 
     async def add_command_run(self, command: dict):
-        async with self._lock:
-            self._commands_run.append(command)
+        self._commands_run.append(command)
 
     async def add_search_performed(self, search: dict):
-        async with self._lock:
-            self._searches_performed.append(search)
+        self._searches_performed.append(search)
+
+    async def add_tool_output(self, output: dict):
+        self._tool_outputs.append(output)
 
     @property
-    def files_read(self) -> frozenset[str]:
-        return frozenset(self._files_read)
+    def files_read(self) -> KeysView[str]:
+        return self._files_read.keys()
 
     @property
-    def files_written(self) -> frozenset[str]:
-        return frozenset(self._files_written)
+    def files_written(self) -> KeysView[str]:
+        return self._files_written.keys()
 
     @property
-    def commands_run(self) -> tuple[dict, ...]:
-        return tuple(self._commands_run)
+    def commands_run(self) -> Sequence[dict]:
+        return _SequenceView(self._commands_run)
 
     @property
-    def searches_performed(self) -> tuple[dict, ...]:
-        return tuple(self._searches_performed)
+    def searches_performed(self) -> Sequence[dict]:
+        return _SequenceView(self._searches_performed)
+
+    @property
+    def tool_outputs(self) -> Sequence[dict]:
+        return _SequenceView(self._tool_outputs)
+
+    def snapshot(self) -> dict:
+        return {
+            "files_read": frozenset(self._files_read),
+            "files_written": frozenset(self._files_written),
+            "commands_run": tuple(self._commands_run),
+            "searches_performed": tuple(self._searches_performed),
+            "tool_outputs": tuple(self._tool_outputs),
+        }
 
     def summary(self) -> str:
+        files_read = sorted(self._files_read)
+        files_written = sorted(self._files_written)
         return f"""
 === SESSION SUMMARY ===
-Files read: {len(self._files_read)}
-Files written: {len(self._files_written)}
+Files read: {len(files_read)}
+Files written: {len(files_written)}
 Commands run: {len(self._commands_run)}
 Searches performed: {len(self._searches_performed)}
 
-Files read: {", ".join(sorted(self._files_read)) if self._files_read else "None"}
-Files written: {", ".join(sorted(self._files_written)) if self._files_written else "None"}
+Files read: {", ".join(files_read) if files_read else "None"}
+Files written: {", ".join(files_written) if files_written else "None"}
 """.strip()
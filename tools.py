@@ -1,17 +1,121 @@
 import asyncio
-import mimetypes
+import functools
+import itertools
+import os
 import re
+import stat
+from collections.abc import Iterator
 from pathlib import Path
 
 import aiofiles
+import aiofiles.os
 
 from errors import ErrorCode, FileError, GitError, SearchError
 
+_SENSITIVE_FILE_RE = re.compile(
+    "|".join(
+        [
+            r"\.env(\.|$)",
+            r"\.pem$",
+            r"id_rsa|id_dsa|id_ecdsa",
+            r"credentials?$",
+            r"\.aws/",
+            r"\.ssh/",
+            r"password\.(txt|yml|yaml|json)$",
+            r"secrets?\.(txt|yml|yaml|json)$",
+            r"\.key$",
+        ]
+    )
+)
+
+_SECRET_RE = re.compile(
+    "|".join(
+        [
+            r'api[_-]?key\s*=\s*["\'][^"\']+["\']',
+            r'password\s*=\s*["\'][^"\']+["\']',
+            r'token\s*=\s*["\'][^"\']+["\']',
+            r"sk_live_[a-zA-Z0-9]+",
+            r"ghp_[a-zA-Z0-9]+",
+        ]
+    ),
+    re.IGNORECASE,
+)
+
+_BINARY_EXTENSIONS = frozenset(
+    {
+        ".pyc",
+        ".pyo",
+        ".so",
+        ".dylib",
+        ".dll",
+        ".jpg",
+        ".jpeg",
+        ".png",
+        ".gif",
+        ".pdf",
+        ".zip",
+        ".tar",
+        ".gz",
+        ".exe",
+        ".bin",
+        ".ico",
+        ".svg",
+        ".woff",
+        ".woff2",
+        ".ttf",
+        ".eot",
+        ".otf",
+        ".mp3",
+        ".mp4",
+        ".avi",
+        ".mov",
+        ".webm",
+        ".webp",
+        ".bmp",
+        ".tiff",
+        ".psd",
+        ".ai",
+        ".eps",
+    }
+)
+
+_DANGEROUS_EXTENSIONS = frozenset({".exe", ".bat", ".sh", ".cmd", ".scr", ".com"})
+
+_SEARCH_BATCH_SIZE = 256
+# Patterns match each line without its trailing newline, so \A and \Z anchor
+# to every line and \n never matches. These tokens could see across line ends
+# in the whole file, so search_files checks such patterns line by line.
+_LINE_CONTEXT_TOKENS = ("\\A", "\\Z", "(?=", "(?!", "(?<")
+_SECRET_SCAN_CONCURRENCY = 8
+
+
+@functools.lru_cache(maxsize=256)
+def _compile(pattern: str, case_sensitive: bool) -> re.Pattern:
+    flags = re.MULTILINE if case_sensitive else re.MULTILINE | re.IGNORECASE
+    return re.compile(pattern, flags)
+
+
+def _format_status_entry(entry: str, orig_path: str | None = None) -> str:
+    kind = entry[0]
+    if kind in "?!":
+        return f"{kind * 2} {entry[2:]}"
+
+    xy = entry[2:4].replace(".", " ")
+    if kind == "1":
+        path = entry.split(" ", 8)[8]
+    elif kind == "2":
+        path = f"{orig_path} -> {entry.split(' ', 9)[9]}"
+    else:
+        path = entry.split(" ", 10)[10]
+    return f"{xy} {path}"
+
 
 class CodebaseTools:
     def __init__(self, root: Path, state):
         self.root = root.resolve()
         self.root.mkdir(parents=True, exist_ok=True)
+        self._root_str = str(self.root)
+        self._root_prefix = os.path.join(self._root_str, "")
         self.state = state
 
         self.max_read_size = 100 * 1024
@@ -21,102 +125,41 @@ class CodebaseTools:
         self.max_search_results = 100
 
     def _secure_path(self, path: str) -> Path:
-        target = (self.root / path).resolve()
-        if not target.is_relative_to(self.root):
+        target = os.path.realpath(os.path.join(self._root_str, path))
+        if target != self._root_str and not target.startswith(self._root_prefix):
             raise FileError(
                 code=ErrorCode.PERMISSION_DENIED,
                 message=f"Path '{path}' is outside workspace",
                 suggestions=["Use relative paths within the workspace"],
-                context={"requested_path": path, "workspace_root": str(self.root)},
+                context={"requested_path": path, "workspace_root": self._root_str},
             )
-        return target
+        return Path(target)
 
     def _is_text_file(self, file_path: Path) -> bool:
-        mime_type, _ = mimetypes.guess_type(str(file_path))
-        if mime_type and not mime_type.startswith("text"):
+        if file_path.suffix.lower() in _BINARY_EXTENSIONS:
             return False
 
-        binary_extensions = {
-            ".pyc",
-            ".pyo",
-            ".so",
-            ".dylib",
-            ".dll",
-            ".jpg",
-            ".jpeg",
-            ".png",
-            ".gif",
-            ".pdf",
-            ".zip",
-            ".tar",
-            ".gz",
-            ".exe",
-            ".bin",
-            ".ico",
-            ".svg",
-            ".woff",
-            ".woff2",
-            ".ttf",
-            ".eot",
-            ".otf",
-            ".mp3",
-            ".mp4",
-            ".avi",
-            ".mov",
-            ".webm",
-            ".webp",
-            ".bmp",
-            ".tiff",
-            ".psd",
-            ".ai",
-            ".eps",
-        }
-        if file_path.suffix.lower() in binary_extensions:
+        try:
+            fd = os.open(file_path, os.O_RDONLY)
+        except OSError:
             return False
-
         try:
-            with open(file_path, "rb") as f:
-                sample = f.read(1024)
-                if b"\x00" in sample:
-                    return False
-        except Exception:
+            return b"\x00" not in os.read(fd, 1024)
+        except OSError:
             return False
-
-        return True
+        finally:
+            os.close(fd)
 
     def _is_sensitive_file(self, file_path: str) -> bool:
-        sensitive_patterns = [
-            r"\.env(\.|$)",
-            r"\.pem$",
-            r"id_rsa|id_dsa|id_ecdsa",
-            r"credentials?$",
-            r"\.aws/",
-            r"\.ssh/",
-            r"password\.(txt|yml|yaml|json)$",
-            r"secrets?\.(txt|yml|yaml|json)$",
-            r"\.key$",
-        ]
-
-        path_lower = file_path.lower()
-        return any(re.search(pattern, path_lower) for pattern in sensitive_patterns)
+        return _SENSITIVE_FILE_RE.search(file_path.lower()) is not None
 
     async def _contains_secrets(self, file_path: str) -> bool:
-        secret_patterns = [
-            r'api[_-]?key\s*=\s*["\'][^"\']+["\']',
-            r'password\s*=\s*["\'][^"\']+["\']',
-            r'token\s*=\s*["\'][^"\']+["\']',
-            r"sk_live_[a-zA-Z0-9]+",
-            r"ghp_[a-zA-Z0-9]+",
-        ]
-
         try:
             target = self._secure_path(file_path)
-            loop = asyncio.get_event_loop()
-            exists = await loop.run_in_executor(None, target.exists)
-            if not exists or not await loop.run_in_executor(None, target.is_file):
+            stat_result = await aiofiles.os.stat(target)
+            if not stat.S_ISREG(stat_result.st_mode):
                 return False
 
-            stat_result = await loop.run_in_executor(None, target.stat)
             if stat_result.st_size > 100 * 1024:
                 return False
 
@@ -124,19 +167,20 @@ class CodebaseTools:
                 target, "r", encoding="utf-8", errors="ignore"
             ) as f:
                 content = await f.read()
-                return any(
-                    re.search(pattern, content, re.IGNORECASE)
-                    for pattern in secret_patterns
-                )
+                return _SECRET_RE.search(content) is not None
         except Exception:
             return False
 
+    def _write_text(self, target: Path, content: str) -> None:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content, encoding="utf-8")
+
     async def read_file(self, path: str, max_chars: int = 10000) -> str:
         target = self._secure_path(path)
 
-        loop = asyncio.get_event_loop()
-        exists = await loop.run_in_executor(None, target.exists)
-        if not exists:
+        try:
+            stat_result = await aiofiles.os.stat(target)
+        except (FileNotFoundError, NotADirectoryError):
             raise FileError(
                 code=ErrorCode.FILE_NOT_FOUND,
                 message=f"File '{path}' does not exist",
@@ -148,9 +192,8 @@ class CodebaseTools:
                 context={"requested_path": path},
             )
 
-        is_file = await loop.run_in_executor(None, target.is_file)
-        if not is_file:
-            is_dir = await loop.run_in_executor(None, target.is_dir)
+        if not stat.S_ISREG(stat_result.st_mode):
+            is_dir = stat.S_ISDIR(stat_result.st_mode)
             raise FileError(
                 code=ErrorCode.INVALID_PATH,
                 message=f"'{path}' is not a file",
@@ -158,7 +201,6 @@ class CodebaseTools:
                 context={"path_type": "directory" if is_dir else "unknown"},
             )
 
-        stat_result = await loop.run_in_executor(None, target.stat)
         file_size = stat_result.st_size
         if file_size > self.max_read_size:
             raise FileError(
@@ -174,7 +216,7 @@ class CodebaseTools:
 
         try:
             async with aiofiles.open(target, "r", encoding="utf-8") as f:
-                content = await f.read()
+                content = await f.read(max_chars + 1 if max_chars else -1)
         except UnicodeDecodeError:
             raise FileError(
                 code=ErrorCode.INVALID_PATH,
@@ -203,8 +245,7 @@ class CodebaseTools:
                 context={"content_size": len(content), "limit": self.max_write_size},
             )
 
-        dangerous_extensions = {".exe", ".bat", ".sh", ".cmd", ".scr", ".com"}
-        if target.suffix.lower() in dangerous_extensions:
+        if target.suffix.lower() in _DANGEROUS_EXTENSIONS:
             raise FileError(
                 code=ErrorCode.PERMISSION_DENIED,
                 message=f"Cannot write executable file '{path}'",
@@ -212,13 +253,8 @@ class CodebaseTools:
                 context={"file_extension": target.suffix},
             )
 
-        loop = asyncio.get_event_loop()
         try:
-            await loop.run_in_executor(
-                None, lambda: target.parent.mkdir(parents=True, exist_ok=True)
-            )
-            async with aiofiles.open(target, "w", encoding="utf-8") as f:
-                await f.write(content)
+            await asyncio.to_thread(self._write_text, target, content)
         except PermissionError:
             raise FileError(
                 code=ErrorCode.PERMISSION_DENIED,
@@ -230,49 +266,79 @@ class CodebaseTools:
         await self.state.add_file_written(path)
         return f"Successfully wrote {len(content)} characters to {path}"
 
+    def _scan_directory(self, directory: Path) -> list[tuple[str, int, bool]]:
+        with os.scandir(directory) as entries:
+            return sorted(
+                (entry.name, entry.stat().st_size, entry.is_dir()) for entry in entries
+            )
+
     async def list_files(self, directory: str = ".") -> str:
         target = self._secure_path(directory)
-        loop = asyncio.get_event_loop()
 
-        exists = await loop.run_in_executor(None, target.exists)
-        if not exists:
+        try:
+            stat_result = await aiofiles.os.stat(target)
+        except (FileNotFoundError, NotADirectoryError):
             raise FileNotFoundError(f"Directory '{directory}' does not exist")
 
-        is_dir = await loop.run_in_executor(None, target.is_dir)
-        if not is_dir:
+        if not stat.S_ISDIR(stat_result.st_mode):
             raise ValueError(f"'{directory}' is not a directory")
 
-        items = []
-        dir_items = await loop.run_in_executor(None, lambda: sorted(target.iterdir()))
-        for item in dir_items:
-            stat_result = await loop.run_in_executor(None, item.stat)
-            size = stat_result.st_size
-            item_is_dir = await loop.run_in_executor(None, item.is_dir)
-            items.append(f"- {item.name}: file_size={size} bytes, is_dir={item_is_dir}")
+        entries = await asyncio.to_thread(self._scan_directory, target)
+        items = [
+            f"- {name}: file_size={size} bytes, is_dir={item_is_dir}"
+            for name, size, item_is_dir in entries
+        ]
 
         return "\n".join(items) if items else "Directory is empty"
 
     async def create_directory(self, path: str, recursive: bool = True) -> str:
         target = self._secure_path(path)
-        loop = asyncio.get_event_loop()
 
-        exists = await loop.run_in_executor(None, target.exists)
-        if exists:
-            is_dir = await loop.run_in_executor(None, target.is_dir)
-            if is_dir:
+        if await aiofiles.os.path.exists(target):
+            if await aiofiles.os.path.isdir(target):
                 return f"Directory '{path}' already exists"
             else:
                 raise ValueError(f"'{path}' exists but is not a directory")
 
         if recursive:
-            await loop.run_in_executor(
-                None, lambda: target.mkdir(parents=True, exist_ok=True)
-            )
+            await asyncio.to_thread(target.mkdir, parents=True, exist_ok=True)
         else:
-            await loop.run_in_executor(None, lambda: target.mkdir())
+            await asyncio.to_thread(target.mkdir)
 
         return f"Successfully created directory '{path}'"
 
+    def _search_candidates(
+        self, paths: list[Path], extensions: frozenset[str] | None
+    ) -> list[bool]:
+        candidates = []
+        for file_path in paths:
+            if any(part.startswith(".") for part in file_path.parts):
+                candidates.append(False)
+                continue
+
+            if extensions and file_path.suffix not in extensions:
+                candidates.append(False)
+                continue
+
+            try:
+                stat_result = file_path.stat()
+            except OSError:
+                candidates.append(False)
+                continue
+
+            candidates.append(
+                stat.S_ISREG(stat_result.st_mode)
+                and stat_result.st_size <= self.max_search_file_size
+                and self._is_text_file(file_path)
+            )
+        return candidates
+
+    def _next_search_batch(
+        self, walker: Iterator[Path], size: int, extensions: frozenset[str] | None
+    ) -> tuple[list[Path], list[bool]]:
+        batch = list(itertools.islice(walker, size))
+        return batch, self._search_candidates(batch, extensions)
+
     async def search_files(
         self,
         pattern: str,
@@ -292,8 +358,7 @@ class CodebaseTools:
             max_results = self.max_search_results
 
         try:
-            flags = 0 if case_sensitive else re.IGNORECASE
-            regex_pattern = re.compile(pattern, flags)
+            regex_pattern = _compile(pattern, case_sensitive)
         except re.error as e:
             raise SearchError(
                 code=ErrorCode.INVALID_REGEX,
@@ -306,67 +371,81 @@ class CodebaseTools:
                 context={"pattern": pattern, "regex_error": str(e)},
             )
 
+        extensions = frozenset(file_extensions) if file_extensions else None
+        skip_to_match = not any(token in pattern for token in _LINE_CONTEXT_TOKENS)
+        root = self.root
         results = []
         matches_found = 0
         files_scanned = 0
-        loop = asyncio.get_event_loop()
-
-        file_paths = await loop.run_in_executor(
-            None, lambda: list(self.root.rglob("*"))
-        )
-
-        for file_path in file_paths:
-            files_scanned += 1
-            if files_scanned > self.max_files_per_search:
-                results.append(
-                    f"... (stopped after scanning {self.max_files_per_search} files)"
-                )
+        walker = root.rglob("*")
+
+        # One extra path past the limit is pulled so the loop can report the cut-off.
+        remaining = self.max_files_per_search + 1
+        while remaining > 0:
+            batch, candidates = await asyncio.to_thread(
+                self._next_search_batch,
+                walker,
+                min(_SEARCH_BATCH_SIZE, remaining),
+                extensions,
+            )
+            if not batch:
                 break
+            remaining -= len(batch)
 
-            if any(part.startswith(".") for part in file_path.parts):
-                continue
-
-            is_file = await loop.run_in_executor(None, file_path.is_file)
-            if not is_file:
-                continue
-
-            if file_extensions and not any(
-                file_path.suffix == ext for ext in file_extensions
-            ):
-                continue
+            for file_path, is_candidate in zip(batch, candidates):
+                files_scanned += 1
+                if files_scanned > self.max_files_per_search:
+                    results.append(
+                        f"... (stopped after scanning {self.max_files_per_search} files)"
+                    )
+                    break
 
-            try:
-                stat_result = await loop.run_in_executor(None, file_path.stat)
-                if stat_result.st_size > self.max_search_file_size:
+                if not is_candidate:
                     continue
-            except (OSError, PermissionError):
-                continue
 
-            is_text = await loop.run_in_executor(None, self._is_text_file, file_path)
-            if not is_text:
-                continue
+                try:
+                    async with aiofiles.open(file_path, "r", encoding="utf-8") as f:
+                        content = await f.read()
+                except (UnicodeDecodeError, PermissionError):
+                    continue
 
-            try:
-                async with aiofiles.open(file_path, "r", encoding="utf-8") as f:
-                    line_num = 0
-                    async for line in f:
-                        line_num += 1
-                        if regex_pattern.search(line):
-                            matches_found += 1
-                            rel_path = file_path.relative_to(self.root)
-                            results.append(f"{rel_path}:{line_num}: {line.strip()}")
-
-                            if matches_found >= max_results:
-                                results.append(
-                                    f"... (truncated at {max_results} matches)"
-                                )
-                                break
-
-                    if matches_found >= max_results:
-                        break
-
-            except (UnicodeDecodeError, PermissionError):
-                continue
+                rel_path = file_path.relative_to(root)
+                line_num = 1
+                line_start = 0
+                while line_start < len(content):
+                    if skip_to_match:
+                        match = regex_pattern.search(content, line_start)
+                        if match is None or (
+                            match.start() == len(content) and content.endswith("\n")
+                        ):
+                            break
+
+                        line_num += content.count("\n", line_start, match.start())
+                        line_start = content.rfind("\n", 0, match.start()) + 1
+
+                    line_end = content.find("\n", line_start)
+                    if line_end == -1:
+                        line_end = len(content)
+
+                    line = content[line_start:line_end]
+                    if regex_pattern.search(line):
+                        matches_found += 1
+                        results.append(f"{rel_path}:{line_num}: {line.strip()}")
+                        if matches_found >= max_results:
+                            results.append(f"... (truncated at {max_results} matches)")
+                            break
+
+                    line_num += 1
+                    line_start = line_end + 1
+
+                if matches_found >= max_results:
+                    break
+
+            if (
+                files_scanned > self.max_files_per_search
+                or matches_found >= max_results
+            ):
+                break
 
         await self.state.add_search_performed(
             {
@@ -387,57 +466,38 @@ class CodebaseTools:
         try:
             proc = await asyncio.create_subprocess_exec(
                 "git",
-                "rev-parse",
-                "--git-dir",
+                "status",
+                "--porcelain=v2",
+                "--branch",
+                "-z",
                 cwd=self.root,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
             )
-            await asyncio.wait_for(proc.wait(), timeout=30.0)
-            if proc.returncode != 0:
-                return "Error: Not a git repository"
+            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=30.0)
         except asyncio.TimeoutError:
             return "Error: Not a git repository"
+        if proc.returncode != 0:
+            return "Error: Not a git repository"
 
         results = []
-
-        try:
-            proc = await asyncio.create_subprocess_exec(
-                "git",
-                "branch",
-                "--show-current",
-                cwd=self.root,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=30.0)
-            if proc.returncode == 0:
-                branch_output = stdout.decode().strip()
-                if branch_output:
-                    results.append(f"Current branch: {branch_output}")
-        except asyncio.TimeoutError:
-            pass
-
-        try:
-            proc = await asyncio.create_subprocess_exec(
-                "git",
-                "status",
-                "--porcelain",
-                cwd=self.root,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=30.0)
-            if proc.returncode == 0:
-                status_output = stdout.decode().strip()
-                if status_output:
-                    results.append("Modified files:")
-                    for line in status_output.split("\n"):
-                        results.append(f"  {line}")
-                else:
-                    results.append("Working directory is clean")
-        except asyncio.TimeoutError:
-            pass
+        changes = []
+        fields = iter(stdout.split(b"\0"))
+        for entry in fields:
+            if entry.startswith(b"# branch.head "):
+                branch = os.fsdecode(entry[len(b"# branch.head ") :])
+                if branch != "(detached)":
+                    results.append(f"Current branch: {branch}")
+            elif entry and not entry.startswith(b"#"):
+                orig_path = os.fsdecode(next(fields)) if entry[:1] == b"2" else None
+                changes.append(_format_status_entry(os.fsdecode(entry), orig_path))
+
+        if changes:
+            results.append("Modified files:")
+            for change in changes:
+                results.append(f"  {change}")
+        else:
+            results.append("Working directory is clean")
 
         try:
             proc = await asyncio.create_subprocess_exec(
@@ -467,45 +527,66 @@ class CodebaseTools:
         if file_path:
             args.append(file_path)
 
-        results = []
+        staged_proc = await asyncio.create_subprocess_exec(
+            "git",
+            *args,
+            "--cached",
+            cwd=self.root,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        unstaged_proc = await asyncio.create_subprocess_exec(
+            "git",
+            *args,
+            cwd=self.root,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
 
         try:
-            proc = await asyncio.create_subprocess_exec(
-                "git",
-                *args,
-                "--cached",
-                cwd=self.root,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+            (staged_stdout, _), (unstaged_stdout, _) = await asyncio.wait_for(
+                asyncio.gather(staged_proc.communicate(), unstaged_proc.communicate()),
+                timeout=30.0,
             )
-            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=30.0)
-            if proc.returncode == 0:
-                staged_output = stdout.decode().strip()
-                if staged_output:
-                    results.append("=== STAGED CHANGES ===")
-                    results.append(staged_output)
         except asyncio.TimeoutError:
-            pass
-
-        try:
-            proc = await asyncio.create_subprocess_exec(
-                "git",
-                *args,
-                cwd=self.root,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+            for proc in (staged_proc, unstaged_proc):
+                if proc.returncode is None:
+                    proc.kill()
+                    await proc.wait()
+            raise GitError(
+                code=ErrorCode.GIT_ERROR,
+                message="Timeout running git diff",
+                suggestions=[
+                    "Diff a single file with file_path",
+                    "Check git repository status",
+                ],
+                context={},
             )
-            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=30.0)
+
+        results = []
+        sections = (
+            ("=== STAGED CHANGES ===", staged_proc, staged_stdout),
+            ("=== UNSTAGED CHANGES ===", unstaged_proc, unstaged_stdout),
+        )
+        for header, proc, stdout in sections:
             if proc.returncode == 0:
-                unstaged_output = stdout.decode().strip()
-                if unstaged_output:
-                    results.append("=== UNSTAGED CHANGES ===")
-                    results.append(unstaged_output)
-        except asyncio.TimeoutError:
-            pass
+                output = stdout.decode().strip()
+                if output:
+                    results.append(header)
+                    results.append(output)
 
         return "\n".join(results) if results else "No changes found"
 
+    async def _check_commit_file(
+        self, file_path: str, semaphore: asyncio.Semaphore
+    ) -> str | None:
+        if self._is_sensitive_file(file_path):
+            return file_path
+        async with semaphore:
+            if await self._contains_secrets(file_path):
+                return f"{file_path} (contains potential secrets)"
+        return None
+
     async def git_commit(self, message: str, add_all: bool = False) -> str:
         if not message.strip():
             raise GitError(
@@ -531,6 +612,7 @@ class CodebaseTools:
                     "git",
                     "status",
                     "--porcelain",
+                    "-z",
                     cwd=self.root,
                     stdout=asyncio.subprocess.PIPE,
                     stderr=asyncio.subprocess.PIPE,
@@ -544,19 +626,22 @@ class CodebaseTools:
                         context={},
                     )
 
-                status_output = stdout.decode().strip()
-
-                dangerous_files = []
-
-                for line in status_output.split("\n"):
-                    if line:
-                        file_path = line[3:].strip()
-                        if self._is_sensitive_file(file_path):
-                            dangerous_files.append(file_path)
-                        elif await self._contains_secrets(file_path):
-                            dangerous_files.append(
-                                f"{file_path} (contains potential secrets)"
-                            )
+                changed_files = []
+                fields = iter(stdout.split(b"\0"))
+                for entry in fields:
+                    if not entry:
+                        continue
+                    if b"R" in entry[:2] or b"C" in entry[:2]:
+                        next(fields, None)
+                    changed_files.append(os.fsdecode(entry[3:]))
+                semaphore = asyncio.Semaphore(_SECRET_SCAN_CONCURRENCY)
+                checks = await asyncio.gather(
+                    *(
+                        self._check_commit_file(file_path, semaphore)
+                        for file_path in changed_files
+                    )
+                )
+                dangerous_files = [check for check in checks if check]
 
                 if dangerous_files:
                     raise GitError(